@@ -2,27 +2,106 @@
 GUI интерфейс для Minecraft Mod Translator Client
 """
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox, scrolledtext
+from tkinter import ttk
+import collections
+import functools
 import threading
 import logging
+from logging.handlers import QueueHandler, QueueListener
 import sys
 import queue
-import time
 from pathlib import Path
 from typing import Dict, Any
-import sys
-from pathlib import Path
-sys.path.append(str(Path(__file__).parent.parent))
-from translator_client import TranslationClient, find_jar_files, SUPPORTED_LANGUAGES, AI_PROVIDERS
+
+try:
+    from translator_client_meta import SUPPORTED_LANGUAGES, AI_PROVIDERS
+except ImportError:
+    try:
+        # Импорт как подпакета client.gui
+        from ..translator_client_meta import SUPPORTED_LANGUAGES, AI_PROVIDERS
+    except ImportError:
+        # Запуск файла напрямую: каталог клиента добавляется в sys.path только в этом случае
+        _client_dir = str(Path(__file__).resolve().parent.parent)
+        if _client_dir not in sys.path:
+            sys.path.insert(0, _client_dir)
+        from translator_client_meta import SUPPORTED_LANGUAGES, AI_PROVIDERS
+
+# Максимальное количество строк, хранимых в поле лога
+MAX_LOG_LINES = 5000
+
+# Максимальное количество сообщений очереди, обрабатываемых за один вызов
+QUEUE_BATCH = 200
+
+# Максимальное количество ошибок, перечисляемых в итоговом окне
+MAX_REPORTED_ERRORS = 20
+
+# Клавиши, разрешенные в поле лога: навигация, а также Ctrl/Cmd + C/A
+LOG_NAV_KEYS = frozenset((
+    'Up', 'Down', 'Left', 'Right', 'Prior', 'Next', 'Home', 'End',
+    'Shift_L', 'Shift_R', 'Control_L', 'Control_R', 'Meta_L', 'Meta_R'
+))
+CONTROL_MASK = 0x0004
+COMMAND_MASK = 0x0008  # Command на macOS
+
+# Переменные Tk, считываемые в снимок параметров перед запуском
+SNAPSHOT_VARS = (
+    'input_dir', 'output_dir', 'invalid_dir', 'corrupted_dir', 'server_url',
+    'ai_provider', 'source_lang', 'target_lang', 'backup', 'max_retries',
+    'method', 'threads', 'recursive', 'dry_run', 'skip_health_check'
+)
+
+# Значения выпадающих списков (кортежи создаются один раз и переиспользуются)
+LANGS = tuple(SUPPORTED_LANGUAGES)
+PROVIDERS = tuple(AI_PROVIDERS)
+METHODS = ('google', 'google2', 'bing')
+BACKUP = ('yes', 'no')
+
+
+@functools.lru_cache(maxsize=None)
+def _mb():
+    """Ленивая загрузка tkinter.messagebox (при первом показе диалога)"""
+    import tkinter.messagebox as m
+    return m
+
+
+@functools.lru_cache(maxsize=None)
+def _fd():
+    """Ленивая загрузка tkinter.filedialog (при первом выборе директории)"""
+    import tkinter.filedialog as m
+    return m
+
+
+class GuiHandler(logging.Handler):
+    """Обработчик логов, передающий отформатированные записи в очередь GUI"""
+    def __init__(self, log_queue):
+        super().__init__()
+        self.q = log_queue
+
+    def emit(self, record):
+        # Вызывается в потоке QueueListener; вставка в виджет и перерисовка
+        # выполняются пакетно в TranslatorGUI._poll_log в главном потоке
+        self.q.put_nowait(self.format(record))
+
 
 class TranslatorGUI:
+    # Логирование GUI устанавливается один раз на процесс
+    _log_queue_handler = None
+    _log_listener = None
+
     def __init__(self, root):
         self.root = root
         self.root.title("Minecraft Mod Translator")
         self.root.geometry("800x700")
         
-        # Очередь для коммуникации между потоками
-        self.queue = queue.Queue()
+        # Очередь для коммуникации между потоками (append/popleft у deque потокобезопасны);
+        # разбор планируется через after_idle только при появлении сообщений
+        self.queue = collections.deque()
+        self._drain_scheduled = False
+        # Отдельная очередь для строк лога, выводится пакетами
+        # (SimpleQueue: только put/get, без учета незавершенных задач)
+        self.log_queue = queue.SimpleQueue()
+        # Размер скользящего окна лога (в строках)
+        self._max_log_lines = MAX_LOG_LINES
         
         # Переменные для хранения параметров
         self.input_dir = tk.StringVar(value=".")
@@ -43,24 +122,49 @@ class TranslatorGUI:
         
         # Состояния
         self.processing = False
-        self.stop_requested = False
+        self.cancel_event = threading.Event()
         self.client = None
         
+        # Фоновый поток текущего запуска перевода
+        self._run_thread = None
+        
+        # Прогресс: колбэки завершения в потоках пула только дописывают имя файла
+        # в список (append атомарен, блокировка не нужна), периодический опрос
+        # в главном потоке отрисовывает последние значения
+        self._finished = []
+        self._total = 0
+        self._rendered_progress = None
+        self._last_percent = 0.0
+        
+        # Опрос лога и прогресса планируется только на время обработки (None - остановлен)
+        self._log_poll_id = None
+        self._progress_poll_id = None
+        
+        # Ошибки по файлам накапливаются и показываются одним окном по завершении
+        self._errors = []
+        
+        # Обработчики сообщений очереди по типу (заполняют состояние текущего разбора)
+        self._latest_status = None
+        self._events = []
+        self._dispatch = {
+            'status': self._h_status,
+            'complete': self._h_complete,
+            'warning': self._h_warning,
+            'error': self._h_error,
+            'fatal': self._h_fatal
+        }
+        
         self.setup_ui()
-        self.setup_logging()
-        self.start_queue_processing()
 
     def setup_ui(self):
         """Настройка пользовательского интерфейса"""
+        # Окно скрыто на время построения, чтобы геометрия рассчитывалась один раз
+        self.root.withdraw()
+        
         # Основной фрейм
         main_frame = ttk.Frame(self.root, padding="10")
         main_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
         
-        # Настройка веса для растяжения
-        self.root.columnconfigure(0, weight=1)
-        self.root.rowconfigure(0, weight=1)
-        main_frame.columnconfigure(1, weight=1)
-        
         # Заголовок
         title_label = ttk.Label(main_frame, text="Minecraft Mod Translator", font=("Arial", 16, "bold"))
         title_label.grid(row=0, column=0, columnspan=3, pady=(0, 20))
@@ -68,41 +172,11 @@ class TranslatorGUI:
         # Параметры ввода
         row = 1
         
-        # Директория ввода
-        ttk.Label(main_frame, text="Директория с JAR файлами:").grid(row=row, column=0, sticky=tk.W, pady=2)
-        input_frame = ttk.Frame(main_frame)
-        input_frame.grid(row=row, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=2)
-        input_frame.columnconfigure(0, weight=1)
-        ttk.Entry(input_frame, textvariable=self.input_dir).grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
-        ttk.Button(input_frame, text="Обзор", command=self.browse_input).grid(row=0, column=1)
-        row += 1
-        
-        # Директория вывода
-        ttk.Label(main_frame, text="Директория для переведенных:").grid(row=row, column=0, sticky=tk.W, pady=2)
-        output_frame = ttk.Frame(main_frame)
-        output_frame.grid(row=row, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=2)
-        output_frame.columnconfigure(0, weight=1)
-        ttk.Entry(output_frame, textvariable=self.output_dir).grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
-        ttk.Button(output_frame, text="Обзор", command=self.browse_output).grid(row=0, column=1)
-        row += 1
-        
-        # Директория невалидных файлов
-        ttk.Label(main_frame, text="Директория для невалидных:").grid(row=row, column=0, sticky=tk.W, pady=2)
-        invalid_frame = ttk.Frame(main_frame)
-        invalid_frame.grid(row=row, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=2)
-        invalid_frame.columnconfigure(0, weight=1)
-        ttk.Entry(invalid_frame, textvariable=self.invalid_dir).grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
-        ttk.Button(invalid_frame, text="Обзор", command=self.browse_invalid).grid(row=0, column=1)
-        row += 1
-        
-        # Директория поврежденных файлов
-        ttk.Label(main_frame, text="Директория для поврежденных:").grid(row=row, column=0, sticky=tk.W, pady=2)
-        corrupted_frame = ttk.Frame(main_frame)
-        corrupted_frame.grid(row=row, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=2)
-        corrupted_frame.columnconfigure(0, weight=1)
-        ttk.Entry(corrupted_frame, textvariable=self.corrupted_dir).grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
-        ttk.Button(corrupted_frame, text="Обзор", command=self.browse_corrupted).grid(row=0, column=1)
-        row += 1
+        # Директории
+        row = self._dir_row(main_frame, row, "Директория с JAR файлами:", self.input_dir)
+        row = self._dir_row(main_frame, row, "Директория для переведенных:", self.output_dir)
+        row = self._dir_row(main_frame, row, "Директория для невалидных:", self.invalid_dir)
+        row = self._dir_row(main_frame, row, "Директория для поврежденных:", self.corrupted_dir)
         
         # URL сервера
         ttk.Label(main_frame, text="URL сервера:").grid(row=row, column=0, sticky=tk.W, pady=2)
@@ -111,22 +185,22 @@ class TranslatorGUI:
         
         # AI провайдер
         ttk.Label(main_frame, text="AI провайдер:").grid(row=row, column=0, sticky=tk.W, pady=2)
-        ai_provider_combo = ttk.Combobox(main_frame, textvariable=self.ai_provider, values=AI_PROVIDERS, state="readonly")
+        ai_provider_combo = ttk.Combobox(main_frame, textvariable=self.ai_provider, values=PROVIDERS, state="readonly")
         ai_provider_combo.grid(row=row, column=1, sticky=(tk.W, tk.E), pady=2)
         row += 1
         
         # Языки
         ttk.Label(main_frame, text="Исходный язык:").grid(row=row, column=0, sticky=tk.W, pady=2)
-        source_lang_combo = ttk.Combobox(main_frame, textvariable=self.source_lang, values=SUPPORTED_LANGUAGES, state="readonly", width=10)
+        source_lang_combo = ttk.Combobox(main_frame, textvariable=self.source_lang, values=LANGS, state="readonly", width=10)
         source_lang_combo.grid(row=row, column=1, sticky=tk.W, pady=2)
         ttk.Label(main_frame, text="Целевой язык:").grid(row=row, column=2, sticky=tk.W, pady=2, padx=(10, 0))
-        target_lang_combo = ttk.Combobox(main_frame, textvariable=self.target_lang, values=SUPPORTED_LANGUAGES, state="readonly", width=10)
+        target_lang_combo = ttk.Combobox(main_frame, textvariable=self.target_lang, values=LANGS, state="readonly", width=10)
         target_lang_combo.grid(row=row, column=2, sticky=tk.W, pady=2)
         row += 1
         
         # Метод перевода
         ttk.Label(main_frame, text="Метод перевода:").grid(row=row, column=0, sticky=tk.W, pady=2)
-        method_combo = ttk.Combobox(main_frame, textvariable=self.method, values=['google', 'google2', 'bing'], state="readonly")
+        method_combo = ttk.Combobox(main_frame, textvariable=self.method, values=METHODS, state="readonly")
         method_combo.grid(row=row, column=1, sticky=(tk.W, tk.E), pady=2)
         row += 1
         
@@ -136,7 +210,7 @@ class TranslatorGUI:
         
         # Использовать резервный переводчик
         ttk.Label(main_frame, text="Резервный переводчик:").grid(row=row, column=0, sticky=tk.W, pady=2)
-        backup_combo = ttk.Combobox(main_frame, textvariable=self.backup, values=['yes', 'no'], state="readonly", width=10)
+        backup_combo = ttk.Combobox(main_frame, textvariable=self.backup, values=BACKUP, state="readonly", width=10)
         backup_combo.grid(row=row, column=1, sticky=tk.W, pady=2)
         row += 1
         
@@ -183,7 +257,8 @@ class TranslatorGUI:
         row += 1
         
         # Прогресс бар
-        self.progress = ttk.Progressbar(main_frame, mode='determinate')
+        self._pv = tk.DoubleVar(value=0)
+        self.progress = ttk.Progressbar(main_frame, mode='determinate', variable=self._pv)
         self.progress.grid(row=row, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=5)
         row += 1
         
@@ -191,18 +266,53 @@ class TranslatorGUI:
         ttk.Label(main_frame, text="Лог:").grid(row=row, column=0, sticky=tk.W, pady=(10, 0))
         row += 1
         
-        # Текстовое поле с логами
-        self.log_text = scrolledtext.ScrolledText(main_frame, height=15, state=tk.DISABLED)
-        self.log_text.grid(row=row, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
+        # Текстовое поле с логами (всегда в состоянии NORMAL, редактирование блокируется привязками)
+        log_frame = ttk.Frame(main_frame)
+        log_frame.grid(row=row, column=0, columnspan=3, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
+        log_frame.columnconfigure(0, weight=1)
+        log_frame.rowconfigure(0, weight=1)
+        self.log_text = tk.Text(log_frame, height=15)
+        log_scroll = ttk.Scrollbar(log_frame, orient=tk.VERTICAL, command=self.log_text.yview)
+        self.log_text.configure(yscrollcommand=log_scroll.set)
+        self.log_text.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
+        log_scroll.grid(row=0, column=1, sticky=(tk.N, tk.S))
+        self.log_text.bind("<Key>", self._block_log_edit)
+        self.log_text.bind("<<PasteSelection>>", lambda e: "break")
+        if not sys.platform.startswith('darwin'):
+            self.log_text.bind("<Button-2>", lambda e: "break")
+        # Связанные методы для горячего пути вывода лога
+        self._log_insert = self.log_text.insert
+        self._log_see = self.log_text.see
         
         # Контекстное меню для лога
         self.create_context_menu()
         
-        # Настройка веса для растяжения лога
+        # Настройка веса для растяжения (после создания всех дочерних виджетов)
+        self.root.columnconfigure(0, weight=1)
+        self.root.rowconfigure(0, weight=1)
+        main_frame.columnconfigure(1, weight=1)
         main_frame.rowconfigure(row, weight=1)
         
         # Обработка закрытия окна
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        
+        # Единственный расчет геометрии и показ окна
+        self.root.update_idletasks()
+        self.root.deiconify()
+        
+        # Подключение логирования и вывод строк, накопленных при запуске
+        self._install_log_handler()
+        self._start_pollers()
+
+    def _dir_row(self, parent, row, label, var):
+        """Строка выбора директории: метка, поле ввода и кнопка обзора"""
+        ttk.Label(parent, text=label).grid(row=row, column=0, sticky=tk.W, pady=2)
+        frame = ttk.Frame(parent)
+        frame.grid(row=row, column=1, columnspan=2, sticky=(tk.W, tk.E), pady=2)
+        frame.columnconfigure(0, weight=1)
+        ttk.Entry(frame, textvariable=var).grid(row=0, column=0, sticky=(tk.W, tk.E), padx=(0, 5))
+        ttk.Button(frame, text="Обзор", command=lambda: self._browse(var)).grid(row=0, column=1)
+        return row + 1
 
     def create_context_menu(self):
         """Создание контекстного меню для лога"""
@@ -218,7 +328,19 @@ class TranslatorGUI:
 
     def show_context_menu(self, event):
         """Показ контекстного меню"""
-        self.context_menu.tk_popup(event.x_root, event.y_root)
+        try:
+            self.context_menu.tk_popup(event.x_root, event.y_root)
+        finally:
+            # На некоторых платформах tk_popup оставляет захват ввода
+            self.context_menu.grab_release()
+
+    def _block_log_edit(self, event):
+        """Запрет редактирования лога с клавиатуры (навигация и копирование разрешены)"""
+        if event.keysym in LOG_NAV_KEYS:
+            return None
+        if event.state & (CONTROL_MASK | COMMAND_MASK) and event.keysym.lower() in ('c', 'a', 'insert'):
+            return None
+        return "break"
 
     def copy_log(self):
         """Копирование выделенного текста из лога"""
@@ -233,131 +355,226 @@ class TranslatorGUI:
         """Выделение всего текста в логе"""
         self.log_text.tag_add(tk.SEL, "1.0", tk.END)
 
-    def setup_logging(self):
-        """Настройка логирования для GUI"""
-        class GuiHandler(logging.Handler):
-            def __init__(self, queue):
-                super().__init__()
-                self.queue = queue
-                
-            def emit(self, record):
-                msg = self.format(record)
-                self.queue.put(('log', msg))
-        
-        # Очистка существующих обработчиков
-        for handler in logging.root.handlers[:]:
-            logging.root.removeHandler(handler)
-        
-        # Настройка логирования
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                GuiHandler(self.queue)
-            ]
-        )
+    def _install_log_handler(self):
+        """Однократная установка логирования GUI на корневой логгер.
+        
+        Рабочие потоки только кладут записи в очередь (QueueHandler), а
+        форматирование выполняется в отдельном потоке QueueListener.
+        """
+        root_logger = logging.getLogger()
+        root_logger.setLevel(logging.INFO)
+        if TranslatorGUI._log_listener is not None:
+            return
+        
+        # Один форматтер на обработчик; без asctime, чтобы не вызывать strftime на каждую запись
+        handler = GuiHandler(self.log_queue)
+        handler.setFormatter(logging.Formatter('%(levelname)s %(message)s'))
+        
+        raw_log_queue = queue.SimpleQueue()
+        TranslatorGUI._log_queue_handler = QueueHandler(raw_log_queue)
+        TranslatorGUI._log_listener = QueueListener(raw_log_queue, handler)
+        TranslatorGUI._log_listener.start()
+        root_logger.addHandler(TranslatorGUI._log_queue_handler)
+
+    def _uninstall_log_handler(self):
+        """Остановка потока логирования GUI при закрытии окна"""
+        if TranslatorGUI._log_listener is None:
+            return
+        logging.getLogger().removeHandler(TranslatorGUI._log_queue_handler)
+        TranslatorGUI._log_listener.stop()
+        TranslatorGUI._log_listener = None
+        TranslatorGUI._log_queue_handler = None
 
-    def start_queue_processing(self):
-        """Запуск обработки очереди для обновления GUI"""
-        def process_queue():
+    def _start_pollers(self):
+        """Запуск периодического опроса лога и прогресса, если он не запущен"""
+        if self._log_poll_id is None:
+            self._poll_log()
+        if self._progress_poll_id is None:
+            self._progress_poller()
+
+    def _poll_log(self):
+        """
+        Пакетный вывод накопленных строк лога в текстовое поле
+        
+        Опрос повторяется во время обработки и после нее, пока приходят строки
+        (итоги выводятся уже после сброса processing); без работы он не планируется.
+        """
+        # Флаг читается до разбора очереди: строки, записанные до его сброса, не теряются
+        running = self.processing
+        msgs = []
+        # Локальные ссылки вместо поиска атрибутов на каждой итерации
+        get_nowait = self.log_queue.get_nowait
+        append = msgs.append
+        while True:
             try:
-                while True:
-                    message = self.queue.get_nowait()
-                    msg_type, data = message
-                    
-                    if msg_type == 'log':
-                        self.log_text.config(state=tk.NORMAL)
-                        self.log_text.insert(tk.END, data + '\n')
-                        self.log_text.see(tk.END)
-                        self.log_text.config(state=tk.DISABLED)
-                    
-                    elif msg_type == 'progress':
-                        current, total, file_name = data
-                        if total > 0:
-                            progress_value = (current / total) * 100
-                            self.progress['value'] = progress_value
-                            self.status_label['text'] = f"Обработка: {file_name}"
-                            self.file_count_label['text'] = f"Файлов: {current}/{total}"
-                    
-                    elif msg_type == 'status':
-                        self.status_label['text'] = data
-                    
-                    elif msg_type == 'complete':
-                        success_count, total_count = data
-                        self.status_label['text'] = f"Завершено: {success_count}/{total_count}"
-                        self.show_completion_message(success_count, total_count)
-                    
-                    elif msg_type == 'error':
-                        messagebox.showerror("Ошибка", data)
-                    
-                    self.queue.task_done()
+                append(get_nowait())
             except queue.Empty:
-                pass
-            finally:
-                self.root.after(100, process_queue)
+                break
+        
+        if msgs:
+            # Автопрокрутка только если пользователь не пролистал лог вверх
+            pinned = self.log_text.yview()[1] >= 0.999
+            self._log_insert(tk.END, "\n".join(msgs) + "\n")
+            # Удаление старых строк сверх лимита, чтобы поле лога не росло бесконечно
+            line_count = int(self.log_text.index('end-1c').split('.')[0])
+            if line_count > self._max_log_lines:
+                self.log_text.delete('1.0', f'{line_count - self._max_log_lines}.0')
+            if pinned:
+                self._log_see(tk.END)
+        
+        if running or msgs:
+            self._log_poll_id = self.root.after(100, self._poll_log)
+        else:
+            self._log_poll_id = None
+
+    def _progress_poller(self):
+        """Отрисовка последнего значения прогресса (не чаще ~30 раз в секунду)"""
+        # Флаг читается до снимка: после сброса processing снимок окончательный,
+        # и последняя отрисовка перед остановкой опроса показывает итог
+        running = self.processing
+        finished = self._finished
+        done = len(finished)
+        snapshot = (done, self._total, finished[done - 1] if done else '')
+        if snapshot != self._rendered_progress:
+            self._rendered_progress = snapshot
+            current, total, file_name = snapshot
+            if total > 0:
+                # Полоса обновляется через связанную переменную и только при изменении на 1% и более
+                percent = current * 100.0 / total
+                if abs(percent - self._last_percent) >= 1.0 or current == total:
+                    self._last_percent = percent
+                    self._pv.set(percent)
+                # Строка статуса - только во время обработки: рабочий поток сбрасывает
+                # processing до отправки итогового статуса, и поздний опрос его не затрет
+                if running and file_name:
+                    self.status_label['text'] = f"Обработан: {file_name}"
+                self.file_count_label['text'] = f"Файлов: {current}/{total}"
+        
+        if running:
+            self._progress_poll_id = self.root.after(33, self._progress_poller)
+        else:
+            self._progress_poll_id = None
+
+    def _ui(self, fn, *args):
+        """Отложенный вызов в главном потоке после обработки текущих событий.
         
-        self.root.after(100, process_queue)
+        Модальные диалоги не блокируют разбор очереди, в котором они запрошены.
+        """
+        self.root.after_idle(fn, *args)
 
-    def browse_input(self):
-        """Выбор директории ввода"""
-        directory = filedialog.askdirectory(initialdir=self.input_dir.get())
-        if directory:
-            self.input_dir.set(directory)
+    def _post(self, msg_type, data):
+        """Отправка сообщения в GUI (из любого потока)"""
+        self.queue.append((msg_type, data))
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            try:
+                self.root.after_idle(self._drain)
+            except (RuntimeError, tk.TclError):
+                pass  # Окно уже закрыто
 
-    def browse_output(self):
-        """Выбор директории вывода"""
-        directory = filedialog.askdirectory(initialdir=self.output_dir.get())
-        if directory:
-            self.output_dir.set(directory)
+    def _drain(self):
+        """Разбор очереди сообщений в главном потоке"""
+        self._drain_scheduled = False
+        
+        # Не более QUEUE_BATCH сообщений за вызов; из статусов применяется только последний
+        self._latest_status = None
+        events = self._events = []
+        popleft = self.queue.popleft
+        dispatch = self._dispatch
+        for _ in range(QUEUE_BATCH):
+            try:
+                msg_type, data = popleft()
+            except IndexError:
+                break
+            dispatch[msg_type](data)
+        
+        if self._latest_status is not None:
+            self.status_label['text'] = self._latest_status
+        for fn, *args in events:
+            self._ui(fn, *args)
+        
+        # Остаток сверх пакета разбирается следующим вызовом
+        if self.queue and not self._drain_scheduled:
+            self._drain_scheduled = True
+            self.root.after_idle(self._drain)
 
-    def browse_invalid(self):
-        """Выбор директории для невалидных файлов"""
-        directory = filedialog.askdirectory(initialdir=self.invalid_dir.get())
-        if directory:
-            self.invalid_dir.set(directory)
+    def _h_status(self, data):
+        self._latest_status = data
+
+    def _h_complete(self, data):
+        success_count, total_count = data
+        self._latest_status = f"Завершено: {success_count}/{total_count}"
+        self._events.append((self.show_completion_message, success_count, total_count))
+
+    def _h_warning(self, data):
+        self._events.append((_mb().showwarning, "Предупреждение", data))
+
+    def _h_error(self, data):
+        self._errors.append(data)
+
+    def _h_fatal(self, data):
+        self._events.append((self.show_error_message, data))
 
-    def browse_corrupted(self):
-        """Выбор директории для поврежденных файлов"""
-        directory = filedialog.askdirectory(initialdir=self.corrupted_dir.get())
+    def _browse(self, var: tk.StringVar):
+        """Выбор директории для указанной переменной пути"""
+        directory = _fd().askdirectory(initialdir=var.get())
         if directory:
-            self.corrupted_dir.set(directory)
+            var.set(directory)
 
     def start_translation(self):
         """Запуск процесса перевода в отдельном потоке"""
         if self.processing:
             return
         
+        # Снимок параметров в главном потоке: рабочий поток не обращается к Tcl
+        try:
+            cfg = self._snapshot_vars()
+        except tk.TclError:
+            _mb().showerror("Ошибка", "Некорректное числовое значение параметра")
+            return
+        
         # Валидация путей
-        if not self.validate_paths():
+        if not self.validate_paths(cfg):
             return
         
         self.processing = True
-        self.stop_requested = False
+        self.cancel_event.clear()
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
         
         # Сброс прогресса
-        self.progress['value'] = 0
+        self._finished = []
+        self._total = 0
+        self._last_percent = 0.0
+        self._pv.set(0)
+        self._errors = []
         self.status_label['text'] = "Начало обработки..."
         self.file_count_label['text'] = "Файлов: 0/0"
+        self._start_pollers()
         
-        # Запуск в отдельном потоке
-        thread = threading.Thread(target=self._run_translation)
-        thread.daemon = True
-        thread.start()
+        # Запуск в фоновом потоке (daemon): при закрытии окна незавершенные
+        # загрузки не удерживают процесс (потоки ThreadPoolExecutor ожидаются при выходе)
+        self._run_thread = threading.Thread(
+            target=self._run_translation, args=(cfg,), name='translator', daemon=True
+        )
+        self._run_thread.start()
 
-    def validate_paths(self):
+    def _snapshot_vars(self) -> Dict[str, Any]:
+        """Однократное чтение всех переменных Tk в обычный словарь"""
+        return {name: getattr(self, name).get() for name in SNAPSHOT_VARS}
+
+    def validate_paths(self, cfg: Dict[str, Any]):
         """Валидация путей перед обработкой"""
         paths_to_check = [
-            (self.input_dir.get(), "Директория ввода"),
-            (self.output_dir.get(), "Директория вывода"),
-            (self.invalid_dir.get(), "Директория невалидных файлов"),
-            (self.corrupted_dir.get(), "Директория поврежденных файлов")
+            (cfg['input_dir'], "Директория ввода"),
+            (cfg['output_dir'], "Директория вывода"),
+            (cfg['invalid_dir'], "Директория невалидных файлов"),
+            (cfg['corrupted_dir'], "Директория поврежденных файлов")
         ]
         
         for path, name in paths_to_check:
             if not path or path.strip() == "":
-                messagebox.showerror("Ошибка", f"Не указана {name.lower()}")
+                _mb().showerror("Ошибка", f"Не указана {name.lower()}")
                 return False
         
         return True
@@ -365,79 +582,122 @@ class TranslatorGUI:
     def stop_translation(self):
         """Остановка процесса перевода"""
         if self.processing:
-            self.stop_requested = True
+            self.cancel_event.set()
             self.status_label['text'] = "Остановка обработки..."
             logging.info("🛑 Запрошена остановка обработки")
             # Не блокируем UI, продолжаем обработку в фоне
             self.stop_button.config(state=tk.DISABLED)
 
-    def _run_translation(self):
+    def _run_translation(self, cfg: Dict[str, Any]):
         """Внутренний метод запуска процесса перевода"""
         try:
             # Получение параметров
             params = {
-                'fb': self.backup.get(),
-                'cl': self.max_retries.get(),
-                'm': self.method.get(),
-                'f': self.source_lang.get(),
-                't': self.target_lang.get(),
-                'aiProvider': self.ai_provider.get()
+                'fb': cfg['backup'],
+                'cl': cfg['max_retries'],
+                'm': cfg['method'],
+                'f': cfg['source_lang'],
+                't': cfg['target_lang'],
+                'aiProvider': cfg['ai_provider']
             }
             
             # Пути
-            input_path = Path(self.input_dir.get())
-            output_path = Path(self.output_dir.get())
-            invalid_path = Path(self.invalid_dir.get())
-            corrupted_path = Path(self.corrupted_dir.get())
+            input_path = Path(cfg['input_dir'])
+            output_path = Path(cfg['output_dir'])
+            invalid_path = Path(cfg['invalid_dir'])
+            corrupted_path = Path(cfg['corrupted_dir'])
             
-            # Поиск JAR файлов
-            jar_files = find_jar_files(input_path, self.recursive.get())
-            if not jar_files:
-                self.queue.put(('error', "JAR файлы не найдены в указанной директории!"))
-                return
+            # Создание клиента (HTTP-стек загружается только при первом запуске)
+            try:
+                from translator_client import TranslationClient, iter_jar_files
+            except ImportError:
+                from ..translator_client import TranslationClient, iter_jar_files
+            self.client = TranslationClient(cfg['server_url'])
             
+            # Сканирование до обработки: общее количество известно заранее,
+            # прогресс не отстает от ленивой предварительной проверки
+            self._post('status', "Поиск JAR файлов...")
+            jar_files = []
+            for jar_file in iter_jar_files(input_path, cfg['recursive']):
+                if self.cancel_event.is_set():
+                    break
+                jar_files.append(jar_file)
             total_files = len(jar_files)
-            logging.info(f"🔍 Найдено JAR файлов: {total_files}")
             
-            # Создание клиента
-            self.client = TranslationClient(self.server_url.get())
+            if self.cancel_event.is_set():
+                # Остановка во время сканирования - не пустая директория
+                logging.info("🛑 Обработка остановлена пользователем")
+                self._post('status', "Обработка остановлена")
+                return
+            
+            if not total_files:
+                self.cancel_event.set()
+                self._post('warning', "JAR файлы не найдены в указанной директории!")
+                return
+            
+            self._total = total_files
+            logging.info(f"🔍 Найдено JAR файлов: {total_files}")
+            self._post('status', f"Найдено JAR файлов: {total_files}")
             
-            # Обработка файлов с обновлением прогресса
             success_count = 0
-            for i, jar_file in enumerate(jar_files, 1):
-                if self.stop_requested:
-                    logging.info("🛑 Обработка остановлена пользователем")
-                    break
-                
-                # Обновление прогресса
-                self.queue.put(('progress', (i, total_files, jar_file.name)))
-                
-                try:
-                    result = self.client.process_single_file(
-                        jar_file,
-                        output_path,
-                        invalid_path,
-                        corrupted_path,
-                        params
-                    )
-                    if result:
-                        success_count += 1
-                except Exception as e:
-                    logging.error(f"❌ Ошибка при обработке {jar_file.name}: {e}")
-                
-                # Небольшая задержка для обновления UI
-                time.sleep(0.1)
+            
+            def on_result(jar_file, result):
+                """Результат файла из process_files: прогресс и ошибки для окна"""
+                nonlocal success_count
+                # Прогресс: append атомарен, блокировка не нужна
+                self._finished.append(jar_file.name)
+                if result == 'success':
+                    success_count += 1
+                elif result != 'skipped':
+                    # process_single_file не выбрасывает исключений: ошибка файла
+                    # приходит как тип результата ('invalid', 'network_error', ...)
+                    self._post('error', f"{jar_file.name}: {result}")
+            
+            # Общий путь с CLI: окно задач, предварительная проверка,
+            # учет отмены и очистка .part файлов выполняются в process_files
+            self.client.process_files(
+                jar_files,
+                output_path,
+                invalid_path,
+                corrupted_path,
+                params,
+                max_threads=max(1, cfg['threads']),
+                dry_run=cfg['dry_run'],
+                skip_health_check=cfg['skip_health_check'],
+                cancel_event=self.cancel_event,
+                on_result=on_result,
+                show_progress=False
+            )
+            
+            if not self.client.server_available:
+                self.cancel_event.set()
+                self._post('fatal', "Сервер недоступен. Проверьте адрес сервера и подключение.")
+                return
+            if cfg['dry_run']:
+                # Список файлов выведен в журнал, перевод не выполнялся
+                return
             
             # Завершение обработки
-            self.queue.put(('complete', (success_count, total_files)))
+            self._post('complete', (success_count, total_files))
             
         except Exception as e:
             logging.error(f"❌ Критическая ошибка при обработке: {e}")
-            self.queue.put(('error', f"Произошла критическая ошибка: {e}"))
+            self.cancel_event.set()
+            self._post('fatal', f"Произошла критическая ошибка: {e}")
         finally:
+            # Рабочие потоки завершены: сессии и их соединения закрываются сразу
+            if self.client is not None:
+                self.client.close()
             self.processing = False
-            self.queue.put(('status', 'Готов к работе'))
+            self._post('status', 'Готов к работе')
+            self._on_translation_done()
+
+    def _on_translation_done(self):
+        """Завершение запуска (вызывается в рабочем потоке)"""
+        try:
             self.root.after(0, self._update_ui_after_processing)
+        except (RuntimeError, tk.TclError):
+            pass  # Окно уже закрыто
 
     def _update_ui_after_processing(self):
         """Обновление UI после завершения обработки"""
@@ -449,21 +709,41 @@ class TranslatorGUI:
         message = f"Обработка завершена!\n\nУспешно обработано: {success_count} из {total_count} файлов"
         if success_count < total_count:
             message += f"\n\nНеобработанные файлы: {total_count - success_count}"
-        messagebox.showinfo("Успех", message)
+        if self._errors:
+            message += "\n\nОшибки:\n" + self._format_errors()
+            _mb().showwarning("Завершено с ошибками", message)
+        else:
+            _mb().showinfo("Успех", message)
+
+    def show_error_message(self, message):
+        """Показ критической ошибки вместе с накопленными ошибками по файлам"""
+        if self._errors:
+            message += "\n\nОшибки по файлам:\n" + self._format_errors()
+        _mb().showerror("Ошибка", message)
+
+    def _format_errors(self) -> str:
+        """Список первых MAX_REPORTED_ERRORS ошибок для итогового окна"""
+        lines = self._errors[:MAX_REPORTED_ERRORS]
+        if len(self._errors) > MAX_REPORTED_ERRORS:
+            lines.append(f"... и еще {len(self._errors) - MAX_REPORTED_ERRORS}")
+        return "\n".join(lines)
 
     def clear_log(self):
         """Очистка лога"""
-        self.log_text.config(state=tk.NORMAL)
         self.log_text.delete(1.0, tk.END)
-        self.log_text.config(state=tk.DISABLED)
 
     def on_closing(self):
         """Обработка закрытия окна"""
         if self.processing:
-            if messagebox.askyesno("Подтверждение", "Обработка еще не завершена. Закрыть программу?"):
-                self.stop_requested = True
+            if _mb().askyesno("Подтверждение", "Обработка еще не завершена. Закрыть программу?"):
+                # Фоновые потоки - daemon: процесс завершится, не дожидаясь загрузок
+                self.cancel_event.set()
+                if self.client is not None:
+                    self.client.close()
+                self._uninstall_log_handler()
                 self.root.destroy()
         else:
+            self._uninstall_log_handler()
             self.root.destroy()
 
 def main():
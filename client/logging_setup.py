@@ -0,0 +1,79 @@
+"""
+Minecraft Mod Translator Client - Настройка логирования
+Общая настройка логирования для CLI (main.py и translator.py)
+"""
+
+import queue
+import logging
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Optional, Union
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# Поток вывода логов и параметры, с которыми он был настроен
+_log_listener = None
+_log_config = None
+
+
+def setup_logging(log_file: Optional[Union[str, Path]] = None, verbose: bool = False) -> None:
+    """
+    Настройка логирования
+    
+    Рабочие потоки только помещают записи в очередь; вывод в консоль и файл
+    выполняет отдельный поток QueueListener (остановка - stop_logging).
+    Повторный вызов с теми же параметрами ничего не делает.
+    """
+    global _log_listener, _log_config
+    config = (str(log_file) if log_file else None, verbose)
+    if _log_listener is not None and _log_config == config:
+        return
+    
+    log_level = logging.DEBUG if verbose else logging.INFO
+    
+    handlers = [logging.StreamHandler()]
+    
+    if log_file:
+        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    stop_logging()
+    log_queue = queue.SimpleQueue()
+    _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    _log_config = config
+    
+    # Сообщение форматируется окончательно в потоке вывода
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    
+    logging.basicConfig(
+        level=log_level,
+        handlers=[queue_handler],
+        force=True
+    )
+    
+    # Отключаем логирование urllib3 для уменьшения шума
+    logging.getLogger("urllib3").setLevel(logging.WARNING)
+
+
+def stop_logging() -> None:
+    """Остановка потока записи логов; обработчики возвращаются на корневой логгер"""
+    global _log_listener, _log_config
+    if _log_listener is None:
+        return
+    
+    # stop() дожидается записи всех сообщений, оставшихся в очереди
+    _log_listener.stop()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, QueueHandler):
+            root.removeHandler(handler)
+    for handler in _log_listener.handlers:
+        root.addHandler(handler)
+    _log_listener = None
+    _log_config = None
\ No newline at end of file
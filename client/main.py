@@ -4,35 +4,30 @@ Minecraft Mod Translator Client - Главный файл запуска
 """
 
 import argparse
+import os
 import sys
 import logging
+import threading
 from pathlib import Path
 
+try:
+    from logging_setup import setup_logging, stop_logging
+except ImportError:
+    from .logging_setup import setup_logging, stop_logging
 
-def setup_logging(log_file: str = 'translator.log', verbose: bool = False) -> None:
-    """Настройка логирования"""
-    log_format = '%(asctime)s - %(levelname)s - %(message)s'
-    log_level = logging.DEBUG if verbose else logging.INFO
-    
-    handlers = [logging.StreamHandler()]
-    
-    if log_file:
-        Path(log_file).parent.mkdir(parents=True, exist_ok=True)
-        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
-    
-    logging.basicConfig(
-        level=log_level,
-        format=log_format,
-        handlers=handlers,
-        force=True
-    )
-    
-    # Отключаем логирование urllib3 для уменьшения шума
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
 
 
 def parse_arguments():
     """Парсинг аргументов командной строки"""
+    # Общие списки языков и провайдеров (модуль без зависимостей от HTTP-стека)
+    try:
+        from translator_client_meta import SUPPORTED_LANGUAGES, AI_PROVIDERS
+    except ImportError:
+        current_dir = os.path.dirname(os.path.abspath(__file__))
+        if current_dir not in sys.path:
+            sys.path.insert(0, current_dir)
+        from translator_client_meta import SUPPORTED_LANGUAGES, AI_PROVIDERS
+    
     parser = argparse.ArgumentParser(
         description='Minecraft Mod Translator Client',
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
@@ -48,14 +43,14 @@ def parse_arguments():
                         help='Максимальное количество попыток перевода на ключ')
     parser.add_argument('--m', type=str, default='bing', choices=['google', 'google2', 'bing'], 
                         help='Основной метод перевода')
-    parser.add_argument('--f', type=str, default='en', choices=['af', 'sq', 'am', 'ar', 'hy', 'az', 'eu', 'be', 'bn', 'bs', 'bg', 'ca', 'ceb', 'ny', 'zh-CN', 'zh-TW', 'co', 'hr', 'cs', 'da', 'nl', 'en', 'eo', 'et', 'tl', 'fi', 'fr', 'fy', 'gl', 'ka', 'de', 'el', 'gu', 'ht', 'ha', 'haw', 'iw', 'hi', 'hmn', 'hu', 'is', 'ig', 'id', 'ga', 'it', 'ja', 'jw', 'kn', 'kk', 'km', 'ko', 'ku', 'ky', 'lo', 'la', 'lv', 'lt', 'lb', 'mk', 'mg', 'ms', 'ml', 'mt', 'mi', 'mr', 'mn', 'my', 'ne', 'no', 'ps', 'fa', 'pl', 'pt', 'pa', 'ro', 'ru', 'sm', 'gd', 'sr', 'st', 'sn', 'sd', 'si', 'sk', 'sl', 'so', 'es', 'su', 'sw', 'sv', 'tg', 'ta', 'te', 'th', 'tr', 'uk', 'ur', 'uz', 'vi', 'cy', 'xh', 'yi', 'yo', 'zu'], 
+    parser.add_argument('--f', type=str, default='en', choices=SUPPORTED_LANGUAGES, 
                         help='Исходный язык')
-    parser.add_argument('--t', type=str, default='ru', choices=['af', 'sq', 'am', 'ar', 'hy', 'az', 'eu', 'be', 'bn', 'bs', 'bg', 'ca', 'ceb', 'ny', 'zh-CN', 'zh-TW', 'co', 'hr', 'cs', 'da', 'nl', 'en', 'eo', 'et', 'tl', 'fi', 'fr', 'fy', 'gl', 'ka', 'de', 'el', 'gu', 'ht', 'ha', 'haw', 'iw', 'hi', 'hmn', 'hu', 'is', 'ig', 'id', 'ga', 'it', 'ja', 'jw', 'kn', 'kk', 'km', 'ko', 'ku', 'ky', 'lo', 'la', 'lv', 'lt', 'lb', 'mk', 'mg', 'ms', 'ml', 'mt', 'mi', 'mr', 'mn', 'my', 'ne', 'no', 'ps', 'fa', 'pl', 'pt', 'pa', 'ro', 'ru', 'sm', 'gd', 'sr', 'st', 'sn', 'sd', 'si', 'sk', 'sl', 'so', 'es', 'su', 'sw', 'sv', 'tg', 'ta', 'te', 'th', 'tr', 'uk', 'ur', 'uz', 'vi', 'cy', 'xh', 'yi', 'yo', 'zu'], 
+    parser.add_argument('--t', type=str, default='ru', choices=SUPPORTED_LANGUAGES, 
                         help='Целевой язык')
     
     # AI параметры
     parser.add_argument('--ai-provider', type=str, default='openrouter', 
-                        choices=['openrouter', 'ollama'],
+                        choices=AI_PROVIDERS,
                         help='AI провайдер для перевода: openrouter (облачные модели) или ollama (локальные модели)')
     
     # Пути и директории
@@ -96,7 +91,7 @@ def parse_arguments():
 def run_cli(args):
     """Запуск CLI режима"""
     try:
-        from translator_client import TranslationClient, find_jar_files, SUPPORTED_LANGUAGES, AI_PROVIDERS
+        from translator_client import TranslationClient, iter_jar_files, skip_existing_files, cancel_on_interrupt
     except ImportError as e:
         # Add the current directory to the path to ensure modules can be found
         import sys
@@ -104,7 +99,7 @@ def run_cli(args):
         current_dir = os.path.dirname(os.path.abspath(__file__))
         if current_dir not in sys.path:
             sys.path.insert(0, current_dir)
-        from translator_client import TranslationClient, find_jar_files, SUPPORTED_LANGUAGES, AI_PROVIDERS
+        from translator_client import TranslationClient, iter_jar_files, skip_existing_files, cancel_on_interrupt
     
     # Настройка путей
     input_dir = Path(args.input_dir).resolve()
@@ -131,24 +126,20 @@ def run_cli(args):
         logging.error(f"❌ Директория не существует: {input_dir}")
         sys.exit(1)
     
-    # Поиск JAR файлов
-    jar_files = find_jar_files(input_dir, args.recursive)
-    logging.info(f"🔍 Найдено JAR файлов: {len(jar_files)}")
-    
-    if args.skip_existing and jar_files:
-        existing_files = []
-        for file_path in jar_files[:]:  # Создаем копию списка для итерации
-            output_file = output_dir / f"{file_path.stem}.jar"
-            if output_file.exists():
-                logging.info(f"⏭️ Пропуск существующего файла: {file_path.name}")
-                existing_files.append(file_path)
-                jar_files.remove(file_path)
-        
-        logging.info(f"⏭️ Пропущено файлов: {len(existing_files)}")
+    # Поиск и фильтрация JAR файлов - ленивая цепочка генераторов
+    jar_files = iter_jar_files(input_dir, args.recursive)
+    if args.skip_existing:
+        jar_files = skip_existing_files(jar_files, output_dir)
     
-    if not jar_files:
-        logging.warning("⚠️ Нет файлов для обработки")
-        return
+    # В режиме dry-run файлы выводятся по мере обхода, список не строится;
+    # для реальной обработки нужно общее количество (прогресс-бар)
+    if not args.dry_run:
+        jar_files = list(jar_files)
+        logging.info(f"🔍 Найдено JAR файлов для обработки: {len(jar_files)}")
+        
+        if not jar_files:
+            logging.warning("⚠️ Нет файлов для обработки")
+            return
     
     # Параметры обработки
     params = {
@@ -164,16 +155,19 @@ def run_cli(args):
     import time
     start_time = time.time()
     client = TranslationClient(args.server_url)
-    client.process_files(
-        jar_files,
-        output_dir,
-        output_invalid,
-        output_corrupted,
-        params,
-        max_threads=args.threads,
-        dry_run=args.dry_run,
-        skip_health_check=args.skip_health_check
-    )
+    # Ctrl+C останавливает обработку через cancel_event: начатые файлы учитываются в итогах
+    with cancel_on_interrupt(threading.Event()) as cancel_event:
+        client.process_files(
+            jar_files,
+            output_dir,
+            output_invalid,
+            output_corrupted,
+            params,
+            max_threads=args.threads,
+            dry_run=args.dry_run,
+            skip_health_check=args.skip_health_check,
+            cancel_event=cancel_event
+        )
     end_time = time.time()
     
     # Время выполнения
@@ -217,5 +211,8 @@ if __name__ == "__main__":
         logging.info("\n🛑 Обработка прервана пользователем")
         sys.exit(1)
     except Exception as e:
-        logging.critical(f"🔥 Критическая ошибка: {e}", exc_info=True)
-        sys.exit(1)
\ No newline at end of file
+        logging.critical(f"🔥 Критическая ошибка: {type(e).__name__}: {e}")
+        logging.debug("Трассировка ошибки:", exc_info=True)
+        sys.exit(1)
+    finally:
+        stop_logging()
\ No newline at end of file
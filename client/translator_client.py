@@ -3,34 +3,54 @@ Minecraft Mod Translator Client - Рефакторинг
 Основной класс клиента для перевода JAR-файлов модов Minecraft через API сервера
 """
 
-import requests
 import os
+import stat
+import collections
+import contextlib
+import errno
+import functools
+import itertools
 import json
+import re
 import shutil
+import signal
+import tempfile
 import logging
 import time
 import threading
+import uuid
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
-
-# Поддерживаемые языковые коды
-SUPPORTED_LANGUAGES = [
-    'af', 'sq', 'am', 'ar', 'hy', 'az', 'eu', 'be', 'bn', 'bs', 'bg', 'ca', 'ceb', 'ny',
-    'zh-CN', 'zh-TW', 'co', 'hr', 'cs', 'da', 'nl', 'en', 'eo', 'et', 'tl', 'fi', 'fr',
-    'fy', 'gl', 'ka', 'de', 'el', 'gu', 'ht', 'ha', 'haw', 'iw', 'hi', 'hmn', 'hu',
-    'is', 'ig', 'id', 'ga', 'it', 'ja', 'jw', 'kn', 'kk', 'km', 'ko', 'ku', 'ky', 'lo',
-    'la', 'lv', 'lt', 'lb', 'mk', 'mg', 'ms', 'ml', 'mt', 'mi', 'mr', 'mn', 'my', 'ne',
-    'no', 'ps', 'fa', 'pl', 'pt', 'pa', 'ro', 'ru', 'sm', 'gd', 'sr', 'st', 'sn', 'sd',
-    'si', 'sk', 'sl', 'so', 'es', 'su', 'sw', 'sv', 'tg', 'ta', 'te', 'th', 'tr', 'uk',
-    'ur', 'uz', 'vi', 'cy', 'xh', 'yi', 'yo', 'zu'
-]
-
-# Поддерживаемые AI провайдеры
-AI_PROVIDERS = ['openrouter', 'ollama']
+from typing import TYPE_CHECKING, Callable, List, Dict, Optional, Tuple, Union, Iterable, Iterator
+
+# HTTP-стек загружается лениво (_create_session); для аннотаций - только при проверке типов
+if TYPE_CHECKING:
+    import requests
+
+# Поддерживаемые языки и AI провайдеры (общие с GUI)
+try:
+    from translator_client_meta import SUPPORTED_LANGUAGES, SUPPORTED_LANGUAGES_SET, AI_PROVIDERS
+except ImportError:
+    from .translator_client_meta import SUPPORTED_LANGUAGES, SUPPORTED_LANGUAGES_SET, AI_PROVIDERS
+
+class _NullProgress:
+    """Заглушка прогресс-бара (tqdm не установлен или прогресс выводится вызывающим кодом)"""
+    
+    def __init__(self, *args, **kwargs):
+        pass
+    
+    def update(self, n: int = 1) -> None:
+        pass
+    
+    def close(self) -> None:
+        pass
+
+# Прогресс-бар (tqdm опционален; без него используется заглушка с тем же интерфейсом)
+try:
+    from tqdm import tqdm
+    TQDM_AVAILABLE = True
+except ImportError:
+    TQDM_AVAILABLE = False
+    tqdm = _NullProgress
 
 # Константы
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100 MB
@@ -38,14 +58,72 @@ DEFAULT_THREADS = 3
 REQUEST_TIMEOUT = 300  # 5 минут
 MAX_RETRIES = 3
 BACKOFF_FACTOR = 0.5
+DOWNLOAD_BUFSIZE = 256 * 1024  # 256 KB: ответ сервера пишется на диск частями
+UPLOAD_BUFSIZE = 1 << 20  # 1 MB: буфер чтения JAR файла при отправке
+PARTIAL_SUFFIX = '.part'  # временный файл результата до завершения загрузки
+
+# mkstemp создает временный файл с правами 0600: перед переименованием результату
+# возвращаются права, которые дал бы open() с текущей umask
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+OUTPUT_FILE_MODE = 0o666 & ~_UMASK
+
+# Классификация ошибок клиента (4xx) по тексту ответа сервера: ключевые слова
+# объединяются в одно регулярное выражение, текст просматривается за один проход
+CORRUPTED_ERROR_KEYWORDS = ('поврежд', 'corrupted', 'invalid zip', 'not a zip', 'broken archive')
+INVALID_ERROR_KEYWORDS = (
+    'отсутствует папка', 'no folder', 'missing folder', 'assets', 'lang', 'resource', 'translation'
+)
+CORRUPTED_ERROR_RE = re.compile('|'.join(map(re.escape, CORRUPTED_ERROR_KEYWORDS)), re.IGNORECASE)
+INVALID_ERROR_RE = re.compile('|'.join(map(re.escape, INVALID_ERROR_KEYWORDS)), re.IGNORECASE)
+
+# Сигнатуры ZIP: локальный заголовок файла и конец центрального каталога (пустой архив)
+ZIP_MAGIC = (b'PK\x03\x04', b'PK\x05\x06')
+ZIP_EOCD = b'PK\x05\x06'
+ZIP_EOCD_SEARCH = 22 + 65535  # запись конца каталога + максимальный комментарий
+
+# Прогресс-бар: обновление не чаще чем раз в PROGRESS_INTERVAL секунд
+# или после PROGRESS_BATCH завершенных файлов
+PROGRESS_BATCH = 16
+PROGRESS_INTERVAL = 0.5
+
+# Предварительная локальная проверка файлов: число потоков и размер пакета
+PREFILTER_THREADS = 4
+PREFILTER_CHUNK = 32
 
 
 class TranslationClient:
     """Клиент для перевода JAR-файлов через API сервера"""
     
+    # Счетчики статистики, увеличиваемые для каждого результата process_single_file
+    RESULT_STATS = {
+        'success': ('success',),
+        'skipped': ('skipped',),
+        'corrupted': ('corrupted',),
+        'invalid': ('invalid',),
+        'failed': ('failed',),
+        'client_error': ('failed',),
+        'application_error': ('failed',),
+        'server_error': ('server_errors', 'failed'),
+        'retry_exceeded': ('connection_errors', 'failed'),
+        'connection_error': ('connection_errors',),
+        'timeout_error': ('connection_errors',),
+        'network_error': ('connection_errors',)
+    }
+    
     def __init__(self, base_url: str = "http://localhost:8250"):
         self.base_url = base_url
+        # Сессия главного потока (проверка доступности сервера); рабочие потоки
+        # получают собственные сессии через _session()
         self.session = self._create_session()
+        self._tls = threading.local()
+        # Сессии рабочих потоков регистрируются, чтобы закрыть их явно (close_sessions);
+        # поколение отличает сессии, созданные после закрытия предыдущих
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+        self._sessions_generation = 0
+        # Общий boundary для всех запросов клиента: поля формы кодируются один раз
+        self._boundary = uuid.uuid4().hex
         self.stats = {
             'success': 0,
             'failed': 0,
@@ -59,27 +137,71 @@ class TranslationClient:
                 'ollama': 0
             }
         }
-        self.lock = threading.Lock()
         self.server_available = True
+        # Директории, уже созданные за время работы клиента
+        self._created_dirs = set()
     
-    def _create_session(self) -> requests.Session:
-        """Создает сессию с настройками повторных попыток"""
+    def _create_session(self) -> 'requests.Session':
+        """Создает сессию с настройками повторных попыток и keep-alive соединением"""
+        # HTTP-стек импортируется только при создании клиента (не при --help)
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+        
         session = requests.Session()
+        # JAR уже сжат: повторное сжатие ответа сервером только тратит процессорное время
+        session.headers['Accept-Encoding'] = 'identity'
         
         # Настройка повторных попыток
         retry_strategy = Retry(
             total=MAX_RETRIES,
             backoff_factor=BACKOFF_FACTOR,
             status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=["POST"]
+            allowed_methods=["POST"],
+            respect_retry_after_header=True
         )
         
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Сессия принадлежит одному потоку и выполняет один запрос за раз:
+        # достаточно одного соединения на хост
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=1,
+            max_retries=retry_strategy
+        )
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         
         return session
 
+    def _session(self) -> 'requests.Session':
+        """
+        Сессия текущего потока
+        
+        requests.Session не гарантирует потокобезопасность, а общий пул соединений
+        разделяется блокировкой; у каждого рабочего потока свое keep-alive соединение.
+        """
+        tls = self._tls
+        if getattr(tls, 'generation', None) != self._sessions_generation:
+            session = self._create_session()
+            with self._sessions_lock:
+                self._sessions.append(session)
+                tls.generation = self._sessions_generation
+            tls.session = session
+        return tls.session
+
+    def close_sessions(self) -> None:
+        """Закрытие сессий рабочих потоков: соединения освобождаются сразу, а не сборщиком мусора"""
+        with self._sessions_lock:
+            sessions, self._sessions = self._sessions, []
+            self._sessions_generation += 1
+        for session in sessions:
+            session.close()
+
+    def close(self) -> None:
+        """Закрытие всех сессий клиента"""
+        self.close_sessions()
+        self.session.close()
+
     def validate_server_connection(self, skip_health_check: bool = False) -> bool:
         """Проверка доступности сервера перед началом обработки"""
         if skip_health_check:
@@ -120,22 +242,88 @@ class TranslationClient:
             Tuple[bool, str]: (валиден, сообщение об ошибке)
         """
         try:
-            if not file_path.exists():
+            # Расширение проверяется до обращения к файловой системе
+            if not file_path.name.endswith('.jar'):
+                return False, f"Неверное расширение файла (требуется .jar): {file_path}"
+            
+            # Один вызов stat вместо exists() и двух stat()
+            try:
+                st = file_path.stat()
+            except FileNotFoundError:
                 return False, f"Файл не существует: {file_path}"
             
-            if file_path.stat().st_size == 0:
+            if not stat.S_ISREG(st.st_mode):
+                return False, f"Не является обычным файлом: {file_path}"
+            
+            if st.st_size == 0:
                 return False, f"Файл пустой: {file_path}"
             
-            if file_path.stat().st_size > MAX_FILE_SIZE:
+            if st.st_size > MAX_FILE_SIZE:
                 return False, f"Файл слишком большой (> {MAX_FILE_SIZE/1024/1024}MB): {file_path}"
             
-            if not file_path.name.endswith('.jar'):
-                return False, f"Неверное расширение файла (требуется .jar): {file_path}"
-            
             return True, ""
         except Exception as e:
             return False, f"Ошибка при валидации файла: {e}"
 
+    @staticmethod
+    def has_zip_signature(file_path: Path) -> bool:
+        """
+        Быстрая локальная проверка, что файл является ZIP архивом
+        
+        Проверяется сигнатура в начале файла; если ее нет (например, данные
+        перед архивом), ищется запись конца центрального каталога в хвосте.
+        """
+        with open(file_path, 'rb') as jar_file:
+            if jar_file.read(4) in ZIP_MAGIC:
+                return True
+            
+            file_size = jar_file.seek(0, os.SEEK_END)
+            jar_file.seek(max(0, file_size - ZIP_EOCD_SEARCH))
+            return ZIP_EOCD in jar_file.read()
+
+    @staticmethod
+    def sweep_partial_files(output_dir: Path, started: Optional[float] = None) -> int:
+        """
+        Удаление временных файлов, оставшихся от прерванного запуска
+        
+        Удаляются только файлы клиента (*.jar.part), не изменявшиеся с момента
+        started - REQUEST_TIMEOUT: более свежие могут принадлежать другому запуску,
+        пишущему в ту же директорию (имена временных файлов уникальны, поэтому
+        запуски не пишут в общий файл).
+        
+        Args:
+            started: Время начала запуска (time.time()); по умолчанию - текущее
+        """
+        suffix = f".jar{PARTIAL_SUFFIX}"
+        cutoff = (time.time() if started is None else started) - REQUEST_TIMEOUT
+        removed = 0
+        try:
+            with os.scandir(output_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(suffix) or not entry.is_file(follow_symlinks=False):
+                        continue
+                    try:
+                        if entry.stat(follow_symlinks=False).st_mtime >= cutoff:
+                            continue
+                        os.unlink(entry.path)
+                        removed += 1
+                    except FileNotFoundError:
+                        pass  # Удален другим процессом
+                    except OSError as e:
+                        logging.warning(f"⚠️ Не удалось удалить временный файл {entry.name}: {e}")
+        except FileNotFoundError:
+            return 0
+        
+        if removed:
+            logging.info(f"🧹 Удалено незавершенных файлов: {removed}")
+        return removed
+
+    def _ensure_dir(self, directory: Path) -> None:
+        """Создание директории (mkdir вызывается один раз для каждого пути)"""
+        if directory not in self._created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(directory)
+
     def move_file(self, source_path: Path, target_dir: Path) -> bool:
         """
         Безопасное перемещение файла в указанную директорию
@@ -143,35 +331,61 @@ class TranslationClient:
         Returns:
             bool: Успешность операции
         """
+        target_path = None
         try:
-            target_dir.mkdir(parents=True, exist_ok=True)
-            target_path = target_dir / source_path.name
+            self._ensure_dir(target_dir)
             
-            logging.info(f"📁 Перемещение файла: {source_path} -> {target_path}")
-            
-            # Проверка существования целевого файла
-            if target_path.exists():
-                # Создаем уникальное имя, если файл уже существует
-                counter = 1
-                while target_path.exists():
-                    new_name = f"{source_path.stem}_{counter}{source_path.suffix}"
-                    target_path = target_dir / new_name
+            # Уникальное имя резервируется созданием пустого файла (O_EXCL):
+            # потоки, перемещающие одноименные файлы, не перезапишут друг друга
+            new_name = source_path.name
+            stem, suffix = source_path.stem, source_path.suffix
+            counter = 0
+            while True:
+                if counter:
+                    new_name = f"{stem}_{counter}{suffix}"
+                candidate = target_dir / new_name
+                try:
+                    os.close(os.open(candidate, os.O_WRONLY | os.O_CREAT | os.O_EXCL))
+                except FileExistsError:
                     counter += 1
+                    continue
+                target_path = candidate
+                break
+            
+            logging.debug(f"📁 Перемещение файла: {source_path} -> {target_path}")
             
-            shutil.move(str(source_path), str(target_path))
-            logging.info(f"✅ Файл успешно перемещен: {target_path}")
+            # В пределах одной файловой системы - атомарное переименование поверх
+            # зарезервированного файла, между разными дисками - копирование через shutil.move
+            try:
+                os.replace(source_path, target_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                # shutil.move в Python < 3.9 не принимает Path
+                shutil.move(os.fspath(source_path), os.fspath(target_path))
+            logging.debug(f"✅ Файл успешно перемещен: {target_path}")
             return True
         except Exception as e:
-            logging.error(f"❌ Ошибка при перемещении файла {source_path}: {e}", exc_info=True)
+            # Зарезервированное имя освобождается: при ошибке исходный файл
+            # остается на месте (shutil.move удаляет его только после копирования)
+            if target_path is not None:
+                try:
+                    target_path.unlink()
+                except OSError:
+                    pass
+            logging.error(f"❌ Ошибка при перемещении файла {source_path}: {type(e).__name__}: {e}")
+            logging.debug("Трассировка ошибки:", exc_info=True)
             return False
 
     def handle_error(self, exception: Exception, file_path: Path, 
                     output_invalid: Path, output_corrupted: Path) -> str:
         """Обработка ошибок при запросе к API. Возвращает тип ошибки."""
+        import requests
+        
         error_message = str(exception)
         error_type = "unknown"
         
-        logging.error(f"🚨 Произошла ошибка при обработке {file_path.name}: {error_message}")
+        logging.debug(f"🚨 Произошла ошибка при обработке {file_path.name}: {error_message}")
         
         # Проверка типа исключения
         if isinstance(exception, requests.exceptions.RequestException):
@@ -194,19 +408,21 @@ class TranslationClient:
                     except AttributeError:
                         error_message = str(exception)
                         logging.debug(f"Отладка: ошибка при доступе к response.text: {exception}")
+                
+                # Поле error в JSON может быть объектом или null - классификация работает со строкой
+                error_message = str(error_message)
                     
                 # Анализ HTTP статуса
                 try:
                     status_code = response.status_code
                     if 400 <= status_code < 500:
                         # Клиентские ошибки
-                        error_lower = error_message.lower()
-                        if any(keyword in error_lower for keyword in ["поврежд", "corrupted", "invalid zip", "not a zip", "broken archive"]):
+                        if CORRUPTED_ERROR_RE.search(error_message):
                             error_type = "corrupted"
                             self.move_file(file_path, output_corrupted)
                             logging.error(f"🔧 Файл поврежден: {file_path.name} - {error_message}")
                         
-                        elif any(keyword in error_lower for keyword in ["отсутствует папка", "no folder", "missing folder", "assets", "lang", "resource", "translation"]):
+                        elif INVALID_ERROR_RE.search(error_message):
                             error_type = "invalid"
                             self.move_file(file_path, output_invalid)
                             logging.error(f"🧩 Неверная структура мода: {file_path.name} - {error_message}")
@@ -218,8 +434,6 @@ class TranslationClient:
                     elif 500 <= status_code < 600:
                         # Серверные ошибки
                         error_type = "server_error"
-                        with self.lock:
-                            self.stats['server_errors'] += 1
                         logging.error(f"🔥 Серверная ошибка ({status_code}): {file_path.name} - {error_message}")
                 except AttributeError:
                     # Если не удается получить status_code
@@ -241,141 +455,239 @@ class TranslationClient:
                     error_message = f"Сетевая ошибка: {str(exception)}"
                 
                 logging.error(f"🌐 {error_message}: {file_path.name}")
-                with self.lock:
-                    self.stats['connection_errors'] += 1
                 # При сетевых ошибках не перемещаем файл, чтобы можно было повторить обработку
 
         else:
             # Обработка других типов исключений
             error_type = "application_error"
-            logging.error(f"🐞 Ошибка приложения: {file_path.name} - {error_message}", exc_info=True)
-        
-        # Обновление статистики
-        with self.lock:
-            if error_type == "corrupted":
-                self.stats['corrupted'] += 1
-            elif error_type == "invalid":
-                self.stats['invalid'] += 1
-            elif error_type in ["server_error", "client_error", "application_error", "retry_exceeded"]:
-                self.stats['failed'] += 1
+            logging.error(f"🐞 Ошибка приложения: {file_path.name} - {type(exception).__name__}: {error_message}")
+            # Трассировка формируется только при включенном DEBUG (--verbose)
+            logging.debug("Трассировка ошибки:", exc_info=exception)
         
         return error_type
 
-    def process_single_file(self, file_path: Path, output_dir: Path, 
-                          output_invalid: Path, output_corrupted: Path,
-                          params: Dict[str, Union[str, int]]) -> bool:
+    def prefilter_file(self, file_path: Path, output_corrupted: Path) -> Optional[str]:
         """
-        Обработка одного JAR файла
+        Локальная проверка файла перед отправкой (без обращения к серверу)
         
         Returns:
-            bool: Успешность обработки
+            Optional[str]: None, если файл можно отправлять, иначе результат
+                           обработки ('skipped', 'corrupted' или 'failed')
         """
         try:
             # Валидация файла
             is_valid, error_msg = self.validate_jar_file(file_path)
             if not is_valid:
                 logging.warning(f"⚠️ Пропуск файла {file_path.name}: {error_msg}")
-                with self.lock:
-                    self.stats['skipped'] += 1
-                return False
+                return 'skipped'
             
-            logging.info(f"🚀 Обработка файла: {file_path.name}")
-            logging.info(f"⚙️ Параметры перевода: {params}")
+            # Файл без сигнатуры ZIP не отправляется на сервер
+            if not self.has_zip_signature(file_path):
+                logging.error(f"🔧 Файл поврежден (не ZIP архив): {file_path.name}")
+                self.move_file(file_path, output_corrupted)
+                return 'corrupted'
+        except Exception as e:
+            logging.error(f"❌ Ошибка при проверке {file_path.name}: {e}")
+            return 'failed'
+        
+        return None
+
+    def _prefilter(self, file_paths: Iterable[Path], output_corrupted: Path,
+                   cancel_event: Optional[threading.Event] = None) -> Iterator[Tuple[Path, Optional[str]]]:
+        """
+        Предварительная проверка файлов пакетами в отдельном пуле потоков
+        
+        После установки cancel_event следующий пакет не проверяется.
+        
+        Yields:
+            Tuple[Path, Optional[str]]: (файл, результат prefilter_file)
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        
+        check = functools.partial(self.prefilter_file, output_corrupted=output_corrupted)
+        file_iter = iter(file_paths)
+        with ThreadPoolExecutor(max_workers=PREFILTER_THREADS) as prefilter_pool:
+            while cancel_event is None or not cancel_event.is_set():
+                chunk = list(itertools.islice(file_iter, PREFILTER_CHUNK))
+                if not chunk:
+                    return
+                yield from zip(chunk, prefilter_pool.map(check, chunk))
+
+    def process_single_file(self, file_path: Path, output_dir: Path, 
+                          output_invalid: Path, output_corrupted: Path,
+                          params: Dict[str, Union[str, int]],
+                          cancel_event: Optional[threading.Event] = None,
+                          log_buf: Optional[List[str]] = None,
+                          checked: bool = False) -> str:
+        """
+        Обработка одного JAR файла
+        
+        Args:
+            cancel_event: Событие отмены; если установлено, файл не отправляется на сервер
+            log_buf: Буфер для информационных сообщений; если задан, INFO-строки
+                     накапливаются в нем вместо отдельных записей лога
+            checked: Файл уже прошел prefilter_file (локальная проверка не повторяется)
+        
+        Returns:
+            str: Результат обработки: 'success', 'skipped', 'failed'
+                 или тип ошибки из handle_error (см. RESULT_STATS)
+        """
+        log_info = log_buf.append if log_buf is not None else logging.info
+        # Отладочные сообщения не форматируются, если DEBUG выключен
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+        try:
+            # Локальная проверка файла
+            if not checked:
+                rejected = self.prefilter_file(file_path, output_corrupted)
+                if rejected is not None:
+                    return rejected
+            
+            # Проверка отмены перед отправкой (загрузка может длиться минуты)
+            if cancel_event is not None and cancel_event.is_set():
+                log_info(f"⏹️ Обработка {file_path.name} отменена")
+                return 'skipped'
+            
+            if debug:
+                logging.debug(f"🚀 Обработка файла: {file_path.name}")
+                logging.debug(f"⚙️ Параметры перевода: {params}")
             
             # Чтение файла
-            with open(file_path, 'rb') as jar_file:
-                files = {'jarFile': (file_path.name, jar_file, 'application/java-archive')}
+            # Большой буфер: http.client читает тело мелкими блоками,
+            # системный вызов read выполняется раз в UPLOAD_BUFSIZE байт
+            with open(file_path, 'rb', buffering=UPLOAD_BUFSIZE) as jar_file:
+                # Тело запроса читается с диска частями, а не собирается целиком в памяти
+                body = MultipartFileStream(
+                    jar_file, 'jarFile', file_path.name, 'application/java-archive', params,
+                    self._boundary
+                )
+                
+                # Результат пишется во временный файл и переименовывается только после
+                # полной загрузки: прерванный запуск не оставляет обрезанный JAR
+                output_file_path = output_dir / f"{file_path.stem}.jar"
+                partial_path = None
                 
                 try:
                     # Логирование запроса
-                    logging.debug(f"📤 Отправка запроса на {self.base_url} для файла {file_path.name}")
+                    if debug:
+                        logging.debug(f"📤 Отправка запроса на {self.base_url} для файла {file_path.name}")
                     
-                    response = self.session.post(
+                    # stream=True: тело ответа не загружается в память целиком
+                    response = self._session().post(
                         self.base_url,
-                        files=files,
-                        data=params,
-                        timeout=REQUEST_TIMEOUT
+                        data=body,
+                        headers={'Content-Type': body.content_type},
+                        timeout=REQUEST_TIMEOUT,
+                        stream=True
                     )
                     
-                    # Логирование ответа
-                    logging.debug(f"📥 Получен ответ: статус {response.status_code}, размер {len(response.content)} байт")
-                    
-                    # Проверка ответа
-                    if response.status_code >= 400:
-                        logging.warning(f"⚠️ Сервер вернул статус {response.status_code} для {file_path.name}")
+                    with response:
+                        # Проверка ответа
+                        if response.status_code >= 400:
+                            if debug:
+                                logging.debug(f"⚠️ Сервер вернул статус {response.status_code} для {file_path.name}")
+                            # Текст ошибки читается до закрытия ответа: он нужен handle_error
+                            response.content
+                        
+                        response.raise_for_status()
+                        
+                        # Заведомо пустой ответ отклоняется по заголовку, до записи на диск
+                        content_length = response.headers.get('Content-Length')
+                        if content_length is not None and content_length.isdigit() and int(content_length) < 100:
+                            error_msg = "Пустой или слишком маленький ответ от сервера"
+                            logging.error(f"❌ {error_msg} для {file_path.name}")
+                            raise ValueError(error_msg)
+                        
+                        # Сохранение результата частями по мере получения
+                        self._ensure_dir(output_dir)
+                        # Уникальное имя: одноименные файлы из разных поддиректорий (--recursive)
+                        # и запуски с общей директорией вывода не пишут в один .part файл
+                        fd, partial_name = tempfile.mkstemp(
+                            suffix=f".jar{PARTIAL_SUFFIX}", prefix=f"{file_path.stem}.", dir=output_dir
+                        )
+                        partial_path = Path(partial_name)
+                        # iter_content, а не response.raw: обрыв соединения приходит как
+                        # исключение requests и классифицируется handle_error как сетевая ошибка
+                        with os.fdopen(fd, 'wb') as output_file:
+                            for chunk in response.iter_content(DOWNLOAD_BUFSIZE):
+                                output_file.write(chunk)
+                            received_size = output_file.tell()
                     
-                    response.raise_for_status()
+                    # Логирование ответа
+                    if debug:
+                        logging.debug(f"📥 Получен ответ: статус {response.status_code}, размер {received_size} байт")
                     
-                    # Проверка содержимого ответа
-                    if not response.content or len(response.content) < 100:
+                    # Проверка содержимого ответа (ответ без Content-Length проверяется здесь)
+                    if received_size < 100:
                         error_msg = "Пустой или слишком маленький ответ от сервера"
                         logging.error(f"❌ {error_msg} для {file_path.name}")
                         raise ValueError(error_msg)
                     
+                    os.chmod(partial_path, OUTPUT_FILE_MODE)
+                    os.replace(partial_path, output_file_path)
+                    
                 except Exception as e:
+                    # Частично записанный результат удаляется
+                    if partial_path is not None:
+                        try:
+                            partial_path.unlink()
+                        except OSError:
+                            pass
+                    
                     error_type = self.handle_error(e, file_path, output_invalid, output_corrupted)
                     
                     # Если это сетевая ошибка и файл не был перемещен, попробуем вернуть его в очередь
                     if error_type in ["connection_error", "timeout_error", "retry_exceeded", "network_error"]:
-                        logging.info(f"🔄 Файл {file_path.name} останется в исходной директории для повторной обработки")
+                        log_info(f"🔄 Файл {file_path.name} останется в исходной директории для повторной обработки")
                     
-                    return False
+                    return error_type
             
-            # Сохранение результата
-            output_file_name = f"{file_path.stem}.jar"
-            output_file_path = output_dir / output_file_name
-            
-            output_dir.mkdir(parents=True, exist_ok=True)
-            
-            with open(output_file_path, 'wb') as output_file:
-                output_file.write(response.content)
-            
-            # Проверка сохраненного файла
-            if not output_file_path.exists() or output_file_path.stat().st_size < 100:
-                error_msg = "Ошибка при сохранении переведенного файла"
-                logging.error(f"❌ {error_msg} для {file_path.name}")
-                if output_file_path.exists():
-                    output_file_path.unlink()
-                raise Exception(error_msg)
-            
-            logging.info(f"✅ Успешно сохранен: {output_file_path.name}")
+            if debug:
+                logging.debug(f"✅ Успешно сохранен: {output_file_path.name}")
             
             # Удаление оригинального файла
             try:
                 file_path.unlink()
-                logging.info(f"🗑️ Удален оригинальный файл: {file_path.name}")
+                if debug:
+                    logging.debug(f"🗑️ Удален оригинальный файл: {file_path.name}")
             except Exception as e:
                 logging.warning(f"⚠️ Не удалось удалить {file_path.name}: {e}")
                 # Пытаемся переместить в backup если не удалось удалить
                 backup_dir = output_dir / "original_backups"
                 self.move_file(file_path, backup_dir)
             
-            # Обновление статистики по провайдеру
-            ai_provider = params.get('aiProvider', 'openrouter')
-            with self.lock:
-                self.stats['success'] += 1
-                if ai_provider in self.stats['ai_provider']:
-                    self.stats['ai_provider'][ai_provider] += 1
-            
-            return True
+            # Одна строка INFO на успешно обработанный файл (подробности - на уровне DEBUG)
+            log_info(f"✅ {file_path.name} -> {output_file_path.name}")
+            return 'success'
             
         except Exception as e:
-            logging.error(f"❌ Критическая ошибка при обработке {file_path.name}: {e}", exc_info=True)
-            with self.lock:
-                self.stats['failed'] += 1
-            return False
+            # Трассировка формируется только при включенном DEBUG (--verbose)
+            logging.error(f"❌ Критическая ошибка при обработке {file_path.name}: {type(e).__name__}: {e}")
+            logging.debug("Трассировка ошибки:", exc_info=True)
+            return 'failed'
 
-    def process_files(self, file_paths: List[Path], output_dir: Path,
+    def _process_buffered(self, file_path: Path, *args) -> str:
+        """Обработка файла в потоке пула: INFO-строки файла выводятся одной записью"""
+        log_buf = []
+        try:
+            return self.process_single_file(file_path, *args, log_buf=log_buf, checked=True)
+        finally:
+            if log_buf:
+                logging.info("\n".join(log_buf))
+
+    def process_files(self, file_paths: Iterable[Path], output_dir: Path,
                      output_invalid: Path, output_corrupted: Path,
                      params: Dict[str, Union[str, int]], 
                      max_threads: int = DEFAULT_THREADS,
                      dry_run: bool = False,
-                     skip_health_check: bool = False) -> None:
+                     skip_health_check: bool = False,
+                     cancel_event: Optional[threading.Event] = None,
+                     on_result: Optional[Callable[[Path, str], None]] = None,
+                     show_progress: bool = True) -> None:
         """
         Многопоточная обработка файлов
         
         Args:
-            file_paths: Список путей к файлам
+            file_paths: Пути к файлам (список или ленивый итератор, например iter_jar_files)
             output_dir: Директория для результатов
             output_invalid: Директория для невалидных файлов
             output_corrupted: Директория для поврежденных файлов
@@ -383,10 +695,24 @@ class TranslationClient:
             max_threads: Максимальное количество потоков
             dry_run: Режим тестирования без реальной обработки
             skip_health_check: Пропустить проверку доступности сервера
+            cancel_event: Событие отмены; при установке оставшиеся файлы не обрабатываются
+            on_result: Вызывается для каждого учтенного файла (файл, результат) в потоке,
+                       вызвавшем process_files
+            show_progress: Выводить прогресс-бар tqdm (GUI отображает прогресс сам)
         """
-        if not file_paths:
+        # Для итератора количество файлов заранее неизвестно
+        total = len(file_paths) if hasattr(file_paths, '__len__') else None
+        file_iter = iter(file_paths)
+        first_file = next(file_iter, None)
+        if first_file is None:
             logging.warning("📁 JAR файлы не найдены")
             return
+        file_paths = itertools.chain((first_file,), file_iter)
+        
+        # Неизвестный код языка отклонил бы сервер для каждого файла
+        for key in ('f', 't'):
+            if key in params and params[key] not in SUPPORTED_LANGUAGES_SET:
+                logging.warning(f"⚠️ Неизвестный код языка '{params[key]}' (параметр {key})")
         
         # Проверка доступности сервера
         if not dry_run:
@@ -398,48 +724,147 @@ class TranslationClient:
         if dry_run:
             logging.info("🔍 РЕЖИМ ТЕСТИРОВАНИЯ (dry-run) - реальная обработка отключена")
             logging.info(f"⚙️ Параметры обработки (тестовый режим): {params}")
-            for file_path in file_paths:
+            for found_count, file_path in enumerate(file_paths, 1):
                 logging.info(f"📋 Найден файл для обработки: {file_path.name}")
+            logging.info(f"🔍 Найдено JAR файлов: {found_count}")
             return
         
-        logging.info(f"🎯 Начало обработки {len(file_paths)} файлов...")
+        self.sweep_partial_files(output_dir)
+        
+        if total is not None:
+            logging.info(f"🎯 Начало обработки {total} файлов...")
+        else:
+            logging.info("🎯 Начало обработки файлов...")
         logging.info(f"⚙️ Параметры обработки: {params}")
         
-        with ThreadPoolExecutor(max_workers=max_threads) as executor:
-            futures = []
-            
-            for file_path in file_paths:
-                future = executor.submit(
-                    self.process_single_file,
-                    file_path, output_dir, output_invalid, output_corrupted, params
-                )
-                futures.append((future, file_path.name))
-            
-            # Отображение прогресса
-            try:
-                from tqdm import tqdm
-                progress_bar = tqdm(total=len(futures), desc="Обработка файлов", unit="file")
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        
+        # Ограниченное окно: в пуле не более window файлов, новые отправляются
+        # сразу по мере завершения любого из текущих
+        window = max(1, max_threads) * 2
+        # В пул загрузки попадают только файлы, прошедшие локальную проверку
+        checked_iter = self._prefilter(file_paths, output_corrupted, cancel_event)
+        # Результаты собираются в главном потоке, блокировка статистики не нужна
+        results = collections.Counter()
+        pending_updates = 0
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max_threads) as executor:
+                in_flight = {}
+                
+                def submit(file_path: Path) -> None:
+                    future = executor.submit(
+                        self._process_buffered,
+                        file_path, output_dir, output_invalid, output_corrupted, params,
+                        cancel_event
+                    )
+                    in_flight[future] = file_path
+                
+                def record(file_path: Path, result: str) -> None:
+                    """Учет результата файла в итогах и прогрессе"""
+                    nonlocal pending_updates
+                    results[result] += 1
+                    pending_updates += 1
+                    if on_result is not None:
+                        on_result(file_path, result)
+                
+                def submit_next() -> bool:
+                    """Отправка следующего проверенного файла; отклоненные сразу учитываются"""
+                    for file_path, rejected in checked_iter:
+                        if rejected is None:
+                            submit(file_path)
+                            return True
+                        record(file_path, rejected)
+                    return False
+                
+                def cancel_requested() -> bool:
+                    """Отмена оставшихся файлов при установленном cancel_event"""
+                    if cancel_event is None or not cancel_event.is_set():
+                        return False
+                    for pending in in_flight:
+                        pending.cancel()
+                    logging.info("🛑 Обработка остановлена пользователем")
+                    return True
                 
-                for future, filename in futures:
+                def collect(future) -> None:
+                    """Учет результата завершенного файла"""
+                    file_path = in_flight.pop(future)
                     try:
-                        future.result()
+                        result = future.result()
                     except Exception as e:
-                        logging.error(f"❌ Ошибка при обработке {filename}: {e}", exc_info=True)
-                    finally:
-                        progress_bar.update(1)
+                        logging.error(f"❌ Ошибка при обработке {file_path.name}: {type(e).__name__}: {e}")
+                        logging.debug("Трассировка ошибки:", exc_info=True)
+                        result = 'failed'
+                    record(file_path, result)
+                
+                for _ in range(window):
+                    if not submit_next():
+                        break
                 
+                # Отображение прогресса
+                if show_progress and not TQDM_AVAILABLE:
+                    logging.warning("📦 tqdm не установлен. Установите для отображения прогресс-бара: pip install tqdm")
+                progress_bar = (tqdm if show_progress else _NullProgress)(
+                    total=total, desc="Обработка файлов", unit="file",
+                    mininterval=PROGRESS_INTERVAL, maxinterval=2.0, smoothing=0, dynamic_ncols=False
+                )
+                
+                last_update = time.monotonic()
+                while in_flight:
+                    # Ожидание с таймаутом: Ctrl+C обрабатывается и на Windows,
+                    # где блокирующее ожидание не прерывается сигналом
+                    done, _ = wait(in_flight, timeout=PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+                    cancelled = cancel_requested()
+                    for future in done:
+                        collect(future)
+                        # Освободившееся место в окне сразу занимается следующим файлом
+                        if not cancelled:
+                            submit_next()
+                    
+                    if cancelled:
+                        # Уже запущенные файлы отменить нельзя: их результаты (файл мог
+                        # быть сохранен или перемещен) дожидаются и учитываются в итогах
+                        while wait(in_flight, timeout=PROGRESS_INTERVAL).not_done:
+                            pass
+                        for future in list(in_flight):
+                            if future.cancelled():
+                                record(in_flight.pop(future), 'skipped')
+                            else:
+                                collect(future)
+                        # Остаток уже проверенного пакета prefilter: отклоненные файлы
+                        # уже перемещены и учитываются со своим результатом, остальные пропущены
+                        for file_path, rejected in checked_iter:
+                            record(file_path, rejected or 'skipped')
+                        break
+                    
+                    now = time.monotonic()
+                    if pending_updates >= PROGRESS_BATCH or now - last_update >= PROGRESS_INTERVAL:
+                        progress_bar.update(pending_updates)
+                        pending_updates = 0
+                        last_update = now
+                
+                checked_iter.close()
+                if pending_updates:
+                    progress_bar.update(pending_updates)
                 progress_bar.close()
-            except ImportError:
-                logging.warning("📦 tqdm не установлен. Установите для отображения прогресс-бара: pip install tqdm")
-                for future, _ in futures:
-                    try:
-                        future.result()
-                    except Exception as e:
-                        logging.error(f"❌ Ошибка при обработке файла: {e}", exc_info=True)
+        finally:
+            # Рабочие потоки завершены: их keep-alive соединения больше не нужны
+            self.close_sessions()
+        
+        self.record_results(results, params.get('aiProvider', 'openrouter'))
         
         # Вывод статистики
         self.print_statistics()
 
+    def record_results(self, results: Dict[str, int], ai_provider: str = 'openrouter') -> None:
+        """Добавление результатов обработки файлов в статистику"""
+        for result, count in results.items():
+            for key in self.RESULT_STATS.get(result, ()):
+                self.stats[key] += count
+        
+        if ai_provider in self.stats['ai_provider']:
+            self.stats['ai_provider'][ai_provider] += results.get('success', 0)
+
     def print_statistics(self) -> None:
         """Вывод статистики обработки"""
         total_processed = (
@@ -473,18 +898,178 @@ class TranslationClient:
         logging.info("="*60)
 
 
+class MultipartFileStream:
+    """
+    Тело запроса multipart/form-data с файлом, читаемым с диска по частям
+    
+    Длина тела известна заранее (Content-Length), поэтому запрос не
+    отправляется chunked; tell()/seek() позволяют urllib3 перемотать
+    тело при повторной попытке.
+    """
+    
+    def __init__(self, file_obj, field_name: str, file_name: str,
+                 content_type: str, fields: Dict[str, Union[str, int]],
+                 boundary: Optional[str] = None):
+        boundary = boundary or uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        
+        file_part = (
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field_name}"; '
+            f'filename="{self._quote(file_name)}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'
+        )
+        self._head = self._encode_fields(tuple(fields.items()), boundary) + file_part.encode('utf-8')
+        self._tail = f'\r\n--{boundary}--\r\n'.encode('ascii')
+        
+        self._file = file_obj
+        self._file_start = file_obj.tell()
+        self._file_pos = 0
+        self._file_size = os.fstat(file_obj.fileno()).st_size - self._file_start
+        self._file_end = len(self._head) + self._file_size
+        self._length = self._file_end + len(self._tail)
+        self._pos = 0
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _encode_fields(fields: Tuple[Tuple[str, Union[str, int]], ...], boundary: str) -> bytes:
+        """
+        Кодирование текстовых полей формы
+        
+        Параметры и boundary одинаковы для всех файлов запуска, поэтому
+        результат кэшируется и не формируется заново для каждого запроса.
+        """
+        return ''.join(
+            f'--{boundary}\r\n'
+            f'Content-Disposition: form-data; name="{name}"\r\n\r\n'
+            f'{value}\r\n'
+            for name, value in fields
+        ).encode('utf-8')
+    
+    @staticmethod
+    def _quote(value: str) -> str:
+        """Экранирование имени файла в заголовке (как в urllib3, формат HTML5)"""
+        return (value.replace('\\', '\\\\').replace('"', '%22')
+                .replace('\r', '%0D').replace('\n', '%0A'))
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def tell(self) -> int:
+        return self._pos
+    
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self._length
+        self._pos = max(0, min(offset, self._length))
+        return self._pos
+    
+    def read(self, size: Optional[int] = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._length - self._pos
+        
+        chunks = []
+        head_len = len(self._head)
+        while size > 0 and self._pos < self._length:
+            pos = self._pos
+            if pos < head_len:
+                chunk = self._head[pos:pos + size]
+            elif pos < self._file_end:
+                offset = pos - head_len
+                if offset != self._file_pos:
+                    # Перемотка после seek (повторная попытка отправки)
+                    self._file.seek(self._file_start + offset)
+                chunk = self._file.read(min(size, self._file_end - pos))
+                if not chunk:
+                    raise IOError("Файл изменился во время отправки")
+                self._file_pos = offset + len(chunk)
+            else:
+                offset = pos - self._file_end
+                chunk = self._tail[offset:offset + size]
+            
+            self._pos += len(chunk)
+            size -= len(chunk)
+            chunks.append(chunk)
+        
+        return b''.join(chunks)
+
+
+def iter_jar_files(directory: Path, recursive: bool = False) -> Iterator[Path]:
+    """
+    Ленивый поиск JAR файлов через os.scandir
+    
+    Симлинки на директории и скрытые директории не обходятся, недоступные
+    для чтения поддиректории пропускаются; Path создается только для
+    найденных JAR файлов.
+    """
+    stack = [os.fspath(directory)]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = os.scandir(current)
+        except PermissionError as e:
+            logging.warning(f"⚠️ Нет доступа к директории {current}: {e}")
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith('.jar') and entry.is_file():
+                    yield Path(entry.path)
+                elif recursive and not name.startswith('.') and entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+
+
 def find_jar_files(directory: Path, recursive: bool = False) -> List[Path]:
     """Поиск JAR файлов в директории"""
-    jar_files = []
+    return list(iter_jar_files(directory, recursive))
+
+
+def skip_existing_files(jar_files: Iterable[Path], output_dir: Path) -> Iterator[Path]:
+    """
+    Пропуск файлов, для которых в output_dir уже есть результат
+    
+    Содержимое output_dir читается одним проходом os.scandir; количество
+    пропущенных файлов выводится после обхода всех jar_files.
+    """
+    # Один проход по output_dir вместо проверки exists() для каждого файла
+    try:
+        with os.scandir(output_dir) as entries:
+            existing_names = {entry.name for entry in entries}
+    except FileNotFoundError:
+        existing_names = set()
+    
+    skipped_count = 0
+    for file_path in jar_files:
+        if f"{file_path.stem}.jar" in existing_names:
+            logging.info(f"⏭️ Пропуск существующего файла: {file_path.name}")
+            skipped_count += 1
+        else:
+            yield file_path
+    
+    logging.info(f"⏭️ Пропущено файлов: {skipped_count}")
+
+@contextlib.contextmanager
+def cancel_on_interrupt(cancel_event: threading.Event) -> Iterator[threading.Event]:
+    """
+    Первое Ctrl+C устанавливает cancel_event вместо KeyboardInterrupt
+    
+    process_files дожидается уже начатых файлов и учитывает их в итогах;
+    повторное Ctrl+C прерывает ожидание обычным KeyboardInterrupt.
+    Обработчик сигнала можно установить только из главного потока.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        yield cancel_event
+        return
     
-    if recursive:
-        for root, _, files in os.walk(directory):
-            for file in files:
-                if file.endswith('.jar'):
-                    jar_files.append(Path(root) / file)
-    else:
-        for item in directory.iterdir():
-            if item.is_file() and item.name.endswith('.jar'):
-                jar_files.append(item)
+    def handler(signum, frame):
+        logging.info("🛑 Остановка: начатые файлы будут завершены (повторное Ctrl+C - прервать)")
+        cancel_event.set()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
     
-    return jar_files
\ No newline at end of file
+    previous = signal.signal(signal.SIGINT, handler)
+    try:
+        yield cancel_event
+    finally:
+        signal.signal(signal.SIGINT, previous if previous is not None else signal.default_int_handler)
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+Minecraft Mod Translator Client - Константы
+Списки языков и AI провайдеров без зависимостей от HTTP-стека
+(используются GUI до загрузки основного клиента)
+"""
+
+# Поддерживаемые языковые коды
+SUPPORTED_LANGUAGES = (
+    'af', 'sq', 'am', 'ar', 'hy', 'az', 'eu', 'be', 'bn', 'bs', 'bg', 'ca', 'ceb', 'ny',
+    'zh-CN', 'zh-TW', 'co', 'hr', 'cs', 'da', 'nl', 'en', 'eo', 'et', 'tl', 'fi', 'fr',
+    'fy', 'gl', 'ka', 'de', 'el', 'gu', 'ht', 'ha', 'haw', 'iw', 'hi', 'hmn', 'hu',
+    'is', 'ig', 'id', 'ga', 'it', 'ja', 'jw', 'kn', 'kk', 'km', 'ko', 'ku', 'ky', 'lo',
+    'la', 'lv', 'lt', 'lb', 'mk', 'mg', 'ms', 'ml', 'mt', 'mi', 'mr', 'mn', 'my', 'ne',
+    'no', 'ps', 'fa', 'pl', 'pt', 'pa', 'ro', 'ru', 'sm', 'gd', 'sr', 'st', 'sn', 'sd',
+    'si', 'sk', 'sl', 'so', 'es', 'su', 'sw', 'sv', 'tg', 'ta', 'te', 'th', 'tr', 'uk',
+    'ur', 'uz', 'vi', 'cy', 'xh', 'yi', 'yo', 'zu'
+)
+
+# Множество для проверок во время работы (кортеж сохраняет порядок для --help)
+SUPPORTED_LANGUAGES_SET = frozenset(SUPPORTED_LANGUAGES)
+
+# Поддерживаемые AI провайдеры
+AI_PROVIDERS = ('openrouter', 'ollama')
\ No newline at end of file